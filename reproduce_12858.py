@@ -9,18 +9,38 @@ simulating both the host environment and the Docker container environment.
 import os
 import sys
 import tempfile
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 # Ensure we can import from the project
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from openhands.sdk.context.skills import skill as skill_module  # noqa: E402
 
-def create_test_skills(skills_dir: Path):
-    """Create test user skills in the given directory."""
-    skills_dir.mkdir(parents=True, exist_ok=True)
+# Resolved at import time, before any test swaps out the skill directories.
+_HOST_SKILLS_DIR = Path.home() / ".openhands" / "skills"
 
-    skill1 = skills_dir / "deepsolve.md"
-    skill1.write_text("""---
+
+def _iter_md(d: str | os.PathLike[str]):
+    """Yield the names of .md files (or symlinks to files) directly inside ``d``.
+
+    Uses a single ``os.scandir`` pass with a suffix check rather than
+    ``Path.glob("*.md")``, which rebuilds its pattern matcher on every call.
+    """
+    with os.scandir(d) as it:
+        for e in it:
+            if e.name.endswith(".md") and e.is_file():
+                yield e.name
+
+
+def _count_md(d: str | os.PathLike[str]) -> int:
+    """Count the .md files directly inside ``d`` in a single directory scan."""
+    return sum(1 for _ in _iter_md(d))
+
+
+_DEEPSOLVE_MD = b"""---
 name: deepsolve
 triggers:
   - deep-solve
@@ -30,10 +50,9 @@ triggers:
 # Deep Solve Skill
 
 A test user skill for deep analysis.
-""")
+"""
 
-    skill2 = skills_dir / "eda.md"
-    skill2.write_text("""---
+_EDA_MD = b"""---
 name: eda
 triggers:
   - eda
@@ -43,63 +62,147 @@ triggers:
 # EDA Skill
 
 A test user skill for exploratory data analysis.
-""")
+"""
 
-    skill3 = skills_dir / "checkpoint.md"
-    skill3.write_text("""---
+_CHECKPOINT_MD = b"""---
 name: checkpoint
 ---
 
 # Checkpoint Skill
 
 A test user skill for checkpointing.
-""")
+"""
+
+_SKILL_CONTENTS: dict[str, bytes] = {
+    "deepsolve.md": _DEEPSOLVE_MD,
+    "eda.md": _EDA_MD,
+    "checkpoint.md": _CHECKPOINT_MD,
+}
+
+_ROOT_CAUSE = """
+CONFIRMED: Issue #12858 is reproducible.
+
+The SDK defines USER_SKILLS_DIRS using Path.home():
+
+    USER_SKILLS_DIRS = [
+        Path.home() / ".openhands" / "skills",
+        Path.home() / ".openhands" / "microagents",
+    ]
+
+In the Docker container:
+  - Path.home() returns /root (or similar container home)
+  - Docker mounts ~/.openhands at /.openhands (root of filesystem)
+  - So Path.home()/.openhands/skills = /root/.openhands/skills (DOES NOT EXIST)
+  - But the actual skills are at /.openhands/skills (EXISTS)
+
+FIX: The agent-server or SDK should also check /.openhands/skills/
+when running inside a Docker container, or use an environment variable
+to configure the user skills path.
+
+Location of bug: openhands-sdk package
+  File: openhands/sdk/context/skills/skill.py
+  Lines: 658-661 (USER_SKILLS_DIRS constant)
+  Function: load_user_skills() at line 664
+
+"""
+
+
+def _write_bytes(path: str, data: bytes):
+    """Write ``data`` to ``path`` with raw os-level calls, truncating any old content."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    # O_BINARY keeps Windows from translating \n to \r\n; neither flag exists
+    # on every platform.
+    flags |= getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def create_test_skills(skills_dir: Path) -> list[Path]:
+    """Create test user skills in the given directory.
+
+    A skill file already present at its expected size is left alone;
+    matching sizes are accepted as a shortcut for matching content.
+    Returns the files that were actually written.
+    """
+    written = []
+    for name, body in _SKILL_CONTENTS.items():
+        p = skills_dir / name
+        try:
+            if p.stat().st_size == len(body):
+                continue
+        except FileNotFoundError:
+            pass
+        if not written:
+            skills_dir.mkdir(parents=True, exist_ok=True)
+        _write_bytes(os.path.join(skills_dir, name), body)
+        written.append(p)
+
+    return written
 
-    return [skill1, skill2, skill3]
 
+def _emit(lines: list[str]):
+    """Write a block of output lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def test_host_environment():
+
+def _header(title: str) -> list[str]:
+    """Return the banner lines that open each test's output block."""
+    return ["\n" + "=" * 60, title, "=" * 60]
+
+
+def test_host_environment(lines: list[str], written: list[Path]):
     """Test 1: User skills load correctly on the HOST (outside Docker).
 
     This simulates what happens when the agent-server runs locally,
     where Path.home() resolves correctly to the user's home directory.
+    ``written`` lists the host fixtures the caller had to (re)write.
     """
-    print("\n" + "=" * 60)
-    print("TEST 1: Host environment (Path.home() works correctly)")
-    print("=" * 60)
+    lines += _header("TEST 1: Host environment (Path.home() works correctly)")
+    skills_dir = _HOST_SKILLS_DIR
 
-    home_dir = Path.home()
-    skills_dir = home_dir / ".openhands" / "skills"
-
-    # Create test skills
-    created = create_test_skills(skills_dir)
-    print(f"[INFO] Created {len(created)} test skills in {skills_dir}")
-    for f in created:
-        print(f"  - {f}")
+    lines.append(
+        f"[INFO] Ensured {len(_SKILL_CONTENTS)} test skills in {skills_dir} "
+        f"({len(written)} written)"
+    )
+    lines.extend(f"  - {os.fspath(skills_dir / name)}" for name in _SKILL_CONTENTS)
 
     # Now call the actual SDK function
-    from openhands.sdk.context.skills.skill import USER_SKILLS_DIRS, load_user_skills
-
-    print(f"\n[INFO] USER_SKILLS_DIRS resolves to:")
-    for d in USER_SKILLS_DIRS:
-        exists = d.exists()
-        file_count = len(list(d.glob("*.md"))) if exists else 0
-        print(f"  - {d} (exists={exists}, md_files={file_count})")
-
-    skills = load_user_skills()
-    print(f"\n[RESULT] load_user_skills() returned {len(skills)} skills:")
-    for s in skills:
-        print(f"  - name={s.name}, triggers={s.get_triggers()}, source={s.source}")
+    lines.append("\n[INFO] USER_SKILLS_DIRS resolves to:")
+    for d in skill_module.USER_SKILLS_DIRS:
+        ds = os.fspath(d)
+        try:
+            file_count = _count_md(ds)
+        except FileNotFoundError:
+            lines.append(f"  - {ds} (exists=False, md_files=0)")
+            continue
+        except OSError:
+            # Present but not a readable directory (a plain file, or no
+            # permission); glob reported these as empty, so do the same.
+            lines.append(f"  - {ds} (exists=True, md_files=0)")
+            continue
+        lines.append(f"  - {ds} (exists=True, md_files={file_count})")
+
+    skills = skill_module.load_user_skills()
+    lines.append(f"\n[RESULT] load_user_skills() returned {len(skills)} skills:")
+    lines.extend(
+        f"  - name={s.name}, triggers={s.get_triggers()}, source={s.source}"
+        for s in skills
+    )
 
     if len(skills) > 0:
-        print("\n[PASS] User skills loaded successfully on HOST")
+        lines.append("\n[PASS] User skills loaded successfully on HOST")
         return True
     else:
-        print("\n[FAIL] User skills NOT loaded on HOST")
+        lines.append("\n[FAIL] User skills NOT loaded on HOST")
         return False
 
 
-def test_docker_environment():
+def test_docker_environment(tmp_root: Path, lines: list[str]):
     """Test 2: Simulate Docker container where Path.home() points elsewhere.
 
     Inside the agent-server Docker container:
@@ -110,92 +213,90 @@ def test_docker_environment():
 
     This is the ROOT CAUSE of issue #12858.
     """
-    print("\n" + "=" * 60)
-    print("TEST 2: Simulated Docker environment (Path.home() mismatch)")
-    print("=" * 60)
-
+    lines += _header("TEST 2: Simulated Docker environment (Path.home() mismatch)")
     # Create a fake Docker-like environment
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Simulate container structure:
-        # /fake_root  -> what Path.home() returns in container
-        # /fake_mount -> where ~/.openhands actually gets mounted
-        fake_home = Path(tmpdir) / "fake_root"
-        fake_home.mkdir()
-        fake_mount = Path(tmpdir) / ".openhands"
-
-        # Create skills in the mount point (simulating docker volume mount)
-        mount_skills_dir = fake_mount / "skills"
-        created = create_test_skills(mount_skills_dir)
-        print(f"[INFO] Created {len(created)} skills at mount point: {mount_skills_dir}")
-
-        # The container's home directory does NOT have .openhands/skills
-        container_home_skills = fake_home / ".openhands" / "skills"
-        print(f"[INFO] Container home skills dir: {container_home_skills} (exists={container_home_skills.exists()})")
-
-        # Monkey-patch Path.home() to simulate container behavior
-        original_home = Path.home
-        Path.home = staticmethod(lambda: fake_home)
+    # Simulate container structure:
+    # /fake_root  -> what Path.home() returns in container
+    # /fake_mount -> where ~/.openhands actually gets mounted
+    fake_home = tmp_root / "fake_root"
+    fake_home.mkdir()
+    fake_mount = tmp_root / ".openhands"
+
+    # Create skills in the mount point (simulating docker volume mount)
+    mount_skills_dir = fake_mount / "skills"
+    written = create_test_skills(mount_skills_dir)
+    lines.append(
+        f"[INFO] Created {len(written)} skills at mount point: {mount_skills_dir}"
+    )
 
-        try:
-            # Re-import to get fresh USER_SKILLS_DIRS with patched home
-            from openhands.sdk.context.skills import skill as skill_module
+    # The container's home directory does NOT have .openhands/skills
+    container_home_skills = fake_home / ".openhands" / "skills"
+    lines.append(
+        f"[INFO] Container home skills dir: {container_home_skills} "
+        f"(exists={os.path.isdir(container_home_skills)})"
+    )
 
-            # Recalculate USER_SKILLS_DIRS with fake home
-            patched_dirs = [
-                fake_home / ".openhands" / "skills",
-                fake_home / ".openhands" / "microagents",
+    # Simulate container behavior. USER_SKILLS_DIRS was computed from
+    # Path.home() when the SDK module was first imported, so swap the
+    # attribute directly rather than patching Path.home() or reloading
+    # the whole module to pick up the fake home.
+    patched_dirs = [
+        fake_home / ".openhands" / "skills",
+        fake_home / ".openhands" / "microagents",
+    ]
+    original_dirs = skill_module.USER_SKILLS_DIRS
+    skill_module.USER_SKILLS_DIRS = patched_dirs
+
+    try:
+        lines.append("\n[INFO] Patched USER_SKILLS_DIRS (simulating container):")
+        for d in patched_dirs:
+            ds = os.fspath(d)
+            exists = os.path.isdir(ds)
+            lines.append(f"  - {ds} (exists={exists})")
+
+        lines.append("\n[INFO] Actual skill files location:")
+        lines.append(
+            f"  - {mount_skills_dir} (exists={os.path.isdir(mount_skills_dir)}, "
+            f"files={_count_md(mount_skills_dir)})"
+        )
+
+        # Call load_user_skills() - this is what the agent-server does
+        skills = skill_module.load_user_skills()
+
+        lines.append(f"\n[RESULT] load_user_skills() returned {len(skills)} skills")
+
+        if len(skills) == 0:
+            lines += [
+                "\n[FAIL] User skills NOT loaded in container environment",
+                "[REPRODUCED] Issue #12858 is CONFIRMED",
+                "\n[ROOT CAUSE] Path.home() in Docker container resolves to",
+                f"  container home ({fake_home}), but user skills are mounted",
+                f"  at {fake_mount}/skills/ via Docker volume mount.",
+                "  The SDK's USER_SKILLS_DIRS uses Path.home() which doesn't",
+                "  match the Docker volume mount point.",
             ]
-            original_dirs = skill_module.USER_SKILLS_DIRS
-            skill_module.USER_SKILLS_DIRS = patched_dirs
-
-            print(f"\n[INFO] Patched USER_SKILLS_DIRS (simulating container):")
-            for d in patched_dirs:
-                exists = d.exists()
-                print(f"  - {d} (exists={exists})")
-
-            print(f"\n[INFO] Actual skill files location:")
-            print(f"  - {mount_skills_dir} (exists={mount_skills_dir.exists()}, "
-                  f"files={len(list(mount_skills_dir.glob('*.md')))})")
-
-            # Call load_user_skills() - this is what the agent-server does
-            from openhands.sdk.context.skills.skill import load_user_skills
-            skills = load_user_skills()
-
-            print(f"\n[RESULT] load_user_skills() returned {len(skills)} skills")
-
-            if len(skills) == 0:
-                print("\n[FAIL] User skills NOT loaded in container environment")
-                print("[REPRODUCED] Issue #12858 is CONFIRMED")
-                print("\n[ROOT CAUSE] Path.home() in Docker container resolves to")
-                print(f"  container home ({fake_home}), but user skills are mounted")
-                print(f"  at {fake_mount}/skills/ via Docker volume mount.")
-                print("  The SDK's USER_SKILLS_DIRS uses Path.home() which doesn't")
-                print("  match the Docker volume mount point.")
-                return True  # Bug IS reproduced
-            else:
-                print("\n[PASS] Skills loaded (bug NOT reproduced in simulation)")
-                return False
-
-        finally:
-            # Restore
-            Path.home = original_home
-            skill_module.USER_SKILLS_DIRS = original_dirs
-
-
-def test_full_load_all_skills():
+            return True  # Bug IS reproduced
+        else:
+            lines.append("\n[PASS] Skills loaded (bug NOT reproduced in simulation)")
+            return False
+
+    finally:
+        # Restore
+        skill_module.USER_SKILLS_DIRS = original_dirs
+
+
+def test_full_load_all_skills(lines: list[str]):
     """Test 3: Call the full load_all_skills() from the agent-server service,
     which is the exact function called when the /api/skills endpoint is hit.
     """
-    print("\n" + "=" * 60)
-    print("TEST 3: Full load_all_skills() (agent-server service function)")
-    print("=" * 60)
-
-    # Make sure user skills exist on host
-    home_dir = Path.home()
-    skills_dir = home_dir / ".openhands" / "skills"
-    create_test_skills(skills_dir)
-
-    from openhands.agent_server.skills_service import load_all_skills
+    lines += _header("TEST 3: Full load_all_skills() (agent-server service function)")
+    # Imported here because skills_service pulls in the whole agent-server
+    # stack; if that import fails, only this test fails.
+    try:
+        from openhands.agent_server.skills_service import load_all_skills
+    except ImportError as e:
+        lines.append(f"\n[FAIL] Could not import agent-server skills service: {e}")
+        return 0
 
     # Call with load_user=True (same as app-server does)
     result = load_all_skills(
@@ -209,74 +310,100 @@ def test_full_load_all_skills():
         sandbox_exposed_urls=None,
     )
 
-    print(f"\n[RESULT] load_all_skills() sources: {result.sources}")
-    print(f"[RESULT] Total skills: {len(result.skills)}")
-    for s in result.skills:
-        print(f"  - name={s.name}, source={s.source}")
+    lines.append(f"\n[RESULT] load_all_skills() sources: {result.sources}")
+    lines.append(f"[RESULT] Total skills: {len(result.skills)}")
+    lines.extend(f"  - name={s.name}, source={s.source}" for s in result.skills)
 
     user_count = result.sources.get("user", 0)
     if user_count > 0:
-        print(f"\n[PASS] {user_count} user skills loaded on HOST")
+        lines.append(f"\n[PASS] {user_count} user skills loaded on HOST")
     else:
-        print(f"\n[FAIL] 0 user skills loaded on HOST")
+        lines.append("\n[FAIL] 0 user skills loaded on HOST")
 
     return user_count
 
 
-def main():
-    print("=" * 60)
-    print("REPRODUCING ISSUE #12858: User skills do not load in v1.3.0")
-    print("=" * 60)
-
-    # Test 1: Host environment
-    host_works = test_host_environment()
-
-    # Test 2: Docker simulation
-    docker_fails = test_docker_environment()
-
-    # Test 3: Full agent-server function
-    user_count = test_full_load_all_skills()
-
-    # Final report
-    print("\n" + "=" * 60)
-    print("REPRODUCTION REPORT")
-    print("=" * 60)
-    print(f"\nTest 1 - Host environment:     {'PASS' if host_works else 'FAIL'}")
-    print(f"Test 2 - Docker simulation:    {'REPRODUCED (bug confirmed)' if docker_fails else 'NOT reproduced'}")
-    print(f"Test 3 - Agent-server service: {'PASS' if user_count > 0 else 'FAIL'} (user={user_count})")
-
-    print("\n--- ROOT CAUSE ---")
-    if docker_fails:
-        print("""
-CONFIRMED: Issue #12858 is reproducible.
+@dataclass
+class SuiteResult:
+    """Outcome of the three reproduction tests, filled in as each one runs."""
 
-The SDK defines USER_SKILLS_DIRS using Path.home():
+    host: bool = False
+    docker: bool = False
+    user_count: int = 0
 
-    USER_SKILLS_DIRS = [
-        Path.home() / ".openhands" / "skills",
-        Path.home() / ".openhands" / "microagents",
-    ]
+    def report(self) -> str:
+        """Render the final reproduction report."""
+        host = "PASS" if self.host else "FAIL"
+        docker = "REPRODUCED (bug confirmed)" if self.docker else "NOT reproduced"
+        service = "PASS" if self.user_count > 0 else "FAIL"
+        root_cause = _ROOT_CAUSE if self.docker else (
+            "Could not reproduce the Docker path mismatch.\n"
+        )
+        return f"""
+{"=" * 60}
+REPRODUCTION REPORT
+{"=" * 60}
 
-In the Docker container:
-  - Path.home() returns /root (or similar container home)
-  - Docker mounts ~/.openhands at /.openhands (root of filesystem)
-  - So Path.home()/.openhands/skills = /root/.openhands/skills (DOES NOT EXIST)
-  - But the actual skills are at /.openhands/skills (EXISTS)
+Test 1 - Host environment:     {host}
+Test 2 - Docker simulation:    {docker}
+Test 3 - Agent-server service: {service} (user={self.user_count})
 
-FIX: The agent-server or SDK should also check /.openhands/skills/
-when running inside a Docker container, or use an environment variable
-to configure the user skills path.
+--- ROOT CAUSE ---
+{root_cause}"""
 
-Location of bug: openhands-sdk package
-  File: openhands/sdk/context/skills/skill.py
-  Lines: 658-661 (USER_SKILLS_DIRS constant)
-  Function: load_user_skills() at line 664
-""")
-    else:
-        print("Could not reproduce the Docker path mismatch.")
 
-    # Exit with appropriate code
-    sys.exit(0 if docker_fails else 1)
+def _result_or_fail(future: Future, lines: list[str], default):
+    """Return the future's result, or record its traceback and return ``default``."""
+    try:
+        return future.result()
+    except Exception as e:
+        lines.append(f"\n[FAIL] Test raised {type(e).__name__}: {e}")
+        lines.append("".join(traceback.format_exception(e)).rstrip("\n"))
+        return default
+
+
+def main():
+    _emit(
+        [
+            "=" * 60,
+            "REPRODUCING ISSUE #12858: User skills do not load in v1.3.0",
+            "=" * 60,
+        ]
+    )
+
+    result = SuiteResult()
+    # Each test appends to its own block; blocks are written in 1/2/3 order
+    # once the tests finish, whatever order they complete in.
+    blocks: list[list[str]] = [[], [], []]
+
+    try:
+        # Test 2: Docker simulation. Run first and serially: it swaps out
+        # module state, and it must run even if the host tests fail.
+        with tempfile.TemporaryDirectory() as tmp:
+            result.docker = test_docker_environment(Path(tmp), blocks[1])
+
+        # Tests 1 and 3 only read the host skills. This is the one place that
+        # writes them, before both run concurrently, so neither races the
+        # other on the fixture files. Test 3's agent-server import is still
+        # only paid after Test 2.
+        written = create_test_skills(_HOST_SKILLS_DIR)
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            # Test 1: Host environment
+            f1 = ex.submit(test_host_environment, blocks[0], written)
+            # Test 3: Full agent-server function
+            f3 = ex.submit(test_full_load_all_skills, blocks[2])
+            result.host = _result_or_fail(f1, blocks[0], False)
+            result.user_count = _result_or_fail(f3, blocks[2], 0)
+        crashed = f1.exception() is not None or f3.exception() is not None
+    finally:
+        for block in blocks:
+            if block:
+                _emit(block)
+
+    sys.stdout.write(result.report())
+
+    # Exit with appropriate code; a crashed test is never a clean run.
+    sys.exit(0 if result.docker and not crashed else 1)
 
 
 if __name__ == "__main__":